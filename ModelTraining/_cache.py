@@ -0,0 +1,109 @@
+"""
+Small on-disk cache for arrays derived from a source file (e.g. a parsed CSV).
+
+Entries live in ModelTraining/.cache/ (next to this file, whatever the current
+working directory is). Each entry is keyed on the source file's path, its
+modification time in nanoseconds and its size, so editing or replacing the
+source file makes the old entry unreachable; the stale entry is deleted the next
+time a fresh one is written for the same source.
+
+Only numpy is needed, so the scripts that only use numpy can import it too. If the
+cache directory cannot be written (read-only checkout, full disk) the helpers
+simply return the freshly built arrays without caching them.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def _entry_name(source_path, tag):
+    """
+    Name shared by every cache entry of (source_path, tag), without the mtime/size key.
+
+    A short hash of the absolute path keeps two files with the same name in different
+    directories apart.
+    """
+    abs_path = os.path.abspath(source_path)
+    path_hash = hashlib.blake2b(abs_path.encode(), digest_size=4).hexdigest()
+    return f"{tag}_{os.path.basename(abs_path)}_{path_hash}"
+
+
+def _entry_path(source_path, tag, ext, depends_on=()):
+    """
+    Full path of the current cache entry: the name plus an mtime/size key for source_path
+    and for every file in depends_on.
+    """
+    name = _entry_name(source_path, tag)
+    key = ""
+    for path in (source_path, *depends_on):
+        st = os.stat(path)
+        key += f"_{st.st_mtime_ns}_{st.st_size}"
+    return name, os.path.join(CACHE_DIR, f"{name}{key}{ext}")
+
+
+def _store(name, path, write):
+    """
+    Write a cache entry atomically and delete the older entries of the same name.
+
+    Any OSError (e.g. read-only directory) is ignored: the caller already has the data.
+    """
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+        stale = re.compile(re.escape(name) + r"(_\d+_\d+)+\.np[yz]$")
+        for entry in os.listdir(CACHE_DIR):
+            full = os.path.join(CACHE_DIR, entry)
+            if full != path and stale.match(entry):
+                os.remove(full)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def cached_array(source_path, tag, build, mmap_mode=None):
+    """
+    Return build() for source_path, cached as a single .npy file.
+
+    PARAMETERS:
+    - source_path: File the array is derived from (its mtime and size key the cache)
+    - tag: Short name for what is cached (e.g. "parsed")
+    - build: Function without arguments that produces the array on a cache miss
+    - mmap_mode: Passed to np.load on a cache hit (e.g. 'r' for a read-only memory map)
+
+    RETURNS:
+    - The cached or freshly built array
+    """
+    name, path = _entry_path(source_path, tag, ".npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode=mmap_mode)
+    arr = build()
+    _store(name, path, lambda f: np.save(f, arr))
+    return arr
+
+
+def cached_arrays(source_path, tag, build, depends_on=()):
+    """
+    Return the dict of arrays build() produces for source_path, cached as one .npz file.
+
+    Same keying and fallback as cached_array(). depends_on lists other files the arrays
+    are derived from (e.g. a separate label file); their mtime and size are part of the
+    key too, so changing any of them rebuilds the entry.
+    """
+    name, path = _entry_path(source_path, tag, ".npz", depends_on)
+    if os.path.exists(path):
+        with np.load(path) as d:
+            return {key: d[key] for key in d.files}
+    arrays = build()
+    _store(name, path, lambda f: np.savez(f, **arrays))
+    return arrays
@@ -0,0 +1,491 @@
+"""
+Shared training pipeline for the logistic regression models.
+
+The academic and financial training scripts follow the same steps (load CSV,
+normalize to 0-1, train, evaluate, save coefficients). That pipeline lives here
+as train_logreg_from_csv(), and train_academic_model_new.py /
+train_financial_model_new.py are thin drivers that call it with their dataset
+settings.
+
+Running this module with --all trains the academic and financial models in one
+Python process, so the pandas and scikit-learn imports are only paid once (the
+healthcare model has its own script, train_healthcare_model_new.py):
+
+    cd ModelTraining
+    python _train_common.py --all
+
+For datasets too large to load at once, the normalized GUI file can be written
+in chunks (two streaming passes, peak memory is one chunk). Training itself still
+needs the data in memory, the solver works on the whole training set:
+
+    python _train_common.py --normalize ../Data/Financial_Data.csv ../Data/Financial_Data_Normalized.csv --label-col is_fraud
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import confusion_matrix
+from sklearn.model_selection import StratifiedShuffleSplit, cross_validate
+
+from _cache import cached_arrays
+
+
+# Binary classification metrics, all derived from one confusion matrix
+Metrics = namedtuple("Metrics", ["accuracy", "precision", "recall", "f1", "cm"])
+
+# Fitted 0-1 scaling, same meaning as MinMaxScaler's attributes: X_normalized = X * scale_ + min_
+Scaler = namedtuple("Scaler", ["min_", "scale_"])
+
+
+def report_ranges(X, cols, label, check_unit_range=False):
+    """
+    Print the min/max of every feature column.
+
+    The column minimums and maximums come from one vectorized reduction each
+    (X.min(axis=0) / X.max(axis=0)).
+
+    PARAMETERS:
+    - X: Feature matrix (samples x features)
+    - cols: Feature column names, in the same order as the columns of X
+    - label: Heading printed before the ranges
+    - check_unit_range: If True, also report whether every column lies in 0-1
+    """
+    mins = X.min(axis=0)
+    maxs = X.max(axis=0)
+
+    print(label)
+    if check_unit_range:
+        status = (mins >= 0) & (maxs <= 1)
+        for i, (col, mn, mx) in enumerate(zip(cols, mins, maxs)):
+            print(f"     {col:25s}: [{mn:.3f}, {mx:.3f}] {'OK' if status[i] else 'ERROR'}")
+    else:
+        for col, mn, mx in zip(cols, mins, maxs):
+            print(f"     {col:25s}: [{mn:8.2f}, {mx:8.2f}]")
+
+
+def quick_metrics(y_true, y_pred):
+    """
+    Compute accuracy, precision, recall and F1 for a binary classifier.
+
+    All four metrics are derived from a single confusion matrix. Undefined ratios
+    (e.g. no positive predictions) are reported as 0, matching zero_division=0.
+
+    RETURNS:
+    - Metrics(accuracy, precision, recall, f1, cm)
+    """
+    cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
+    tn, fp, fn, tp = cm.ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = (tp + tn) / cm.sum()
+        precision = np.nan_to_num(tp / (tp + fp))
+        recall = np.nan_to_num(tp / (tp + fn))
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+    return Metrics(accuracy, precision, recall, f1, cm)
+
+
+def report_metrics(model, X_train, y_train, X_test, y_test, class_names=("Negative", "Positive")):
+    """
+    Print the training and test set performance of a fitted binary classifier,
+    followed by the confusion matrix of the test set.
+
+    PARAMETERS:
+    - model: Fitted classifier
+    - X_train, y_train: Training features and labels
+    - X_test, y_test: Test features and labels
+    - class_names: (negative, positive) class names, used in the confusion matrix labels
+
+    RETURNS:
+    - train_metrics, test_metrics: Metrics of each set (see quick_metrics)
+    """
+    train_metrics = quick_metrics(y_train, model.predict(X_train))
+    test_metrics = quick_metrics(y_test, model.predict(X_test))
+    
+    for heading, metrics in (("Training Set Performance", train_metrics), ("Test Set Performance", test_metrics)):
+        print(f"\n   {heading}:")
+        print(f"   - Accuracy:  {metrics.accuracy:.4f}")
+        print(f"   - Precision: {metrics.precision:.4f}")
+        print(f"   - Recall:    {metrics.recall:.4f}")
+        print(f"   - F1 Score:  {metrics.f1:.4f}")
+    
+    cm = test_metrics.cm
+    print(f"\n   Confusion Matrix (Test Set):\n"
+          f"   True Negatives ({class_names[0]}):  {cm[0,0]}\n"
+          f"   False Positives:  {cm[0,1]}\n"
+          f"   False Negatives:  {cm[1,0]}\n"
+          f"   True Positives ({class_names[1]}):  {cm[1,1]}")
+    return train_metrics, test_metrics
+
+
+def _safe_ranges(ranges):
+    """
+    Replace zero column ranges by 1, like sklearn's _handle_zeros_in_scale.
+
+    A constant column then maps to 0 with scale 1, so a new sample that differs slightly
+    from the training constant stays close to 0-1 instead of being blown up by 1/epsilon.
+    """
+    ranges[ranges == 0] = 1
+    return ranges
+
+
+def fit_minmax(X):
+    """
+    Scale every column of X to the 0-1 range.
+
+    Same result as MinMaxScaler().fit_transform(X): one min and one range reduction,
+    then the subtraction and division run in place on a single new array, which keeps
+    the input dtype (float32). Constant columns are mapped to 0 and get scale 1,
+    like MinMaxScaler (see _safe_ranges).
+
+    RETURNS:
+    - X_normalized: X scaled to 0-1
+    - scaler: Scaler(min_, scale_) with the same meaning as MinMaxScaler's attributes
+    """
+    mins = X.min(axis=0)
+    ranges = _safe_ranges(np.ptp(X, axis=0))
+    X_normalized = X - mins
+    X_normalized /= ranges
+    return X_normalized, Scaler(min_=-mins / ranges, scale_=1.0 / ranges)
+
+
+def load_or_fit_minmax(data_path, X, feature_columns):
+    """
+    Normalize X to the 0-1 range, reusing a cached result when the CSV is unchanged.
+
+    The normalized matrix and the scaler parameters are cached in ModelTraining/.cache/
+    (see _cache.py), keyed on the CSV's path, modification time (ns) and size, plus a
+    hash of feature_columns, so taking a different label column from the same CSV gets
+    its own entry. A later run on the same file and columns loads them instead of
+    refitting; editing or replacing the CSV changes the key, so a stale entry is never
+    used (and is deleted on the next write). If the cache cannot be written, X is simply
+    normalized without caching.
+
+    PARAMETERS:
+    - data_path: Path of the CSV file X was loaded from
+    - X: Feature matrix (samples x features)
+    - feature_columns: Names of the CSV columns held by X, in order
+
+    RETURNS:
+    - X_normalized: X scaled to 0-1
+    - scaler: Scaler(min_, scale_)
+    """
+    def fit():
+        X_normalized, scaler = fit_minmax(X)
+        return {"X": X_normalized, "min": scaler.min_, "scale": scaler.scale_}
+
+    columns_hash = hashlib.blake2b(",".join(feature_columns).encode(), digest_size=4).hexdigest()
+    d = cached_arrays(data_path, f"minmax_{columns_hash}", fit)
+    return d["X"], Scaler(min_=d["min"], scale_=d["scale"])
+
+
+def _feature_chunks(data_path, label_col=None, chunksize=100_000):
+    """
+    Yield the feature columns of a CSV (header row, label column dropped) as float32 blocks.
+
+    Only one block of chunksize rows is held in memory at a time.
+    """
+    columns = pd.read_csv(data_path, nrows=0).columns
+    if label_col is None or label_col not in columns:
+        label_col = columns[-1]
+    feature_columns = [col for col in columns if col != label_col]
+    for chunk in pd.read_csv(data_path, header=0, usecols=feature_columns, dtype=np.float32,
+                             engine='c', chunksize=chunksize):
+        # Own copy of the block so callers can scale it in place
+        yield chunk[feature_columns].to_numpy(copy=True)
+
+
+def _streaming_min_range(data_path, label_col=None, chunksize=100_000):
+    """
+    Column minimums and (non-zero) ranges of a CSV, reduced one chunk at a time.
+    """
+    mins = maxs = None
+    for a in _feature_chunks(data_path, label_col, chunksize):
+        if mins is None:
+            mins, maxs = a.min(axis=0), a.max(axis=0)
+        else:
+            np.minimum(mins, a.min(axis=0), out=mins)
+            np.maximum(maxs, a.max(axis=0), out=maxs)
+    return mins, _safe_ranges(maxs - mins)
+
+
+def streaming_minmax(data_path, label_col=None, chunksize=100_000):
+    """
+    Fit the 0-1 scaling of a CSV that may not fit in memory.
+
+    Same result as fit_minmax() on the full feature matrix, but the column
+    minimums and maximums are reduced one chunk at a time (peak memory is one chunk).
+
+    RETURNS:
+    - scaler: Scaler(min_, scale_)
+    """
+    mins, ranges = _streaming_min_range(data_path, label_col, chunksize)
+    return Scaler(min_=-mins / ranges, scale_=1.0 / ranges)
+
+
+def write_normalized_streaming(data_path, output_path, label_col=None, chunksize=100_000):
+    """
+    Write the 0-1 normalized features of a large CSV without loading it whole.
+
+    First pass: column minimums and ranges. Second pass: each chunk is scaled in
+    place exactly like fit_minmax() and appended to output_path (no header, same
+    format as the normalized GUI files).
+
+    RETURNS:
+    - scaler: Scaler(min_, scale_) used for the output
+    """
+    mins, ranges = _streaming_min_range(data_path, label_col, chunksize)
+    with open(output_path, "w") as f:
+        for a in _feature_chunks(data_path, label_col, chunksize):
+            a -= mins
+            a /= ranges
+            np.savetxt(f, a, delimiter=",", fmt="%.6f")
+    return Scaler(min_=-mins / ranges, scale_=1.0 / ranges)
+
+
+def find_data_file(filename):
+    """
+    Locate a dataset CSV in Data/ (when run from ModelTraining/) or the current directory.
+    """
+    for path in (os.path.join("..", "Data", filename), filename):
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"Could not find {filename}. Please ensure it's in Data/ or ModelTraining/ directory.")
+
+
+def read_table(data_path):
+    """
+    Parse a dataset CSV (header row, all columns numeric) into one float32 matrix.
+
+    The parsed table is cached as an .npz in ModelTraining/.cache/ keyed on the CSV's
+    path, mtime and size (see _cache.py), so repeated training runs on an unchanged CSV
+    skip the text parse; editing the CSV invalidates the entry.
+
+    PARAMETERS:
+    - data_path: CSV file with a header row
+
+    RETURNS:
+    - columns: List of column names from the header
+    - table: (n_rows, n_columns) float32 array, label column included
+    """
+    def parse():
+        # All columns are numeric, so parse them straight to float32 with the C engine (no dtype inference)
+        df = pd.read_csv(data_path, header=0, dtype=np.float32, engine='c')
+        return {"table": df.to_numpy(copy=False), "columns": np.array(df.columns, dtype=str)}
+
+    parsed = cached_arrays(data_path, "parsed", parse)
+    return parsed["columns"].tolist(), parsed["table"]
+
+
+def train_logreg_from_csv(data_path, label_col=None, output_coef_path="coefs.csv",
+                          normalized_output=None, intercept_scale=0.0,
+                          title="Logistic Regression Model Training", sample_name="samples",
+                          class_names=("Negative", "Positive"), export_original=None,
+                          meta_output=None):
+    """
+    Train a logistic regression model on a CSV file (header row, numeric columns).
+
+    PARAMETERS:
+    - data_path: CSV file with a header row, feature columns and a 0/1 label column
+    - label_col: Name of the label column (None = use the last column)
+    - output_coef_path: Where to save the coefficients (one row per class, no header)
+    - normalized_output: Where to save the normalized features for the GUI (None = skip)
+    - intercept_scale: If non-zero, fold intercept*intercept_scale into the weights
+      (the encrypted operations service does not add an intercept separately)
+    - title: Heading printed at the start of training
+    - sample_name: What one row of the dataset is (e.g. "students"), used in messages
+    - class_names: (negative, positive) class names, used in messages
+    - export_original: Also save the original features without header here (None = skip)
+      Nothing in the encrypted ML system reads this file, it is only for reference
+    - meta_output: Also save a small JSON summary of the saved coefficients here
+      ({"abs_max": largest absolute weight, "shape": [classes, features]}), so other
+      scripts can use those values without parsing the coefficient CSV (None = skip)
+
+    RETURNS:
+    - model: Trained logistic regression model
+    - X_test: Test features (normalized)
+    - y_test: Test labels
+    - scaler: The scaler used for normalization
+    """
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    
+    # Step 1: Load the data
+    print("\n1. Loading training data...")
+    
+    # Read CSV - explicitly use first row as header (cached parse, see read_table)
+    columns, table = read_table(data_path)
+    print(f"   Loaded {len(table)} {sample_name}")
+    print(f"   Columns: {columns}")
+    
+    # Separate features and labels
+    # Exclude the label column from features
+    if label_col is not None and label_col in columns:
+        li = columns.index(label_col)
+        feature_columns = [col for col in columns if col != label_col]
+        X = np.delete(table, li, axis=1)
+        y = table[:, li].astype(np.int8)
+        print(f"   Found '{label_col}' column - using as label")
+    else:
+        # Assume last column is the label
+        feature_columns = columns[:-1]
+        X = table[:, :-1]
+        y = table[:, -1].astype(np.int8)
+        if label_col is not None:
+            print(f"   '{label_col}' not found - using last column as label")
+        print(f"   Label column: {columns[-1]}")
+    
+    print(f"   Features ({len(feature_columns)}): {feature_columns}")
+    print(f"   Feature matrix shape: {X.shape}")
+    # Both class counts from a single bincount
+    counts = np.bincount(y, minlength=2)
+    n_neg, n_pos = counts[0], counts[1]
+    print(f"   Label distribution: {counts}")
+    print(f"   {class_names[1]} {sample_name}: {n_pos} ({100*n_pos/len(y):.1f}%)")
+    print(f"   {class_names[0]} {sample_name}: {n_neg} ({100*n_neg/len(y):.1f}%)")
+    
+    # Step 2: Normalize features to 0-1 range
+    # CRITICAL: Encrypted ML requires all features in 0-1 range
+    print("\n2. Normalizing features to 0-1 range...")
+    print("   (Required for encrypted ML compatibility)")
+    
+    # Reuses the cached normalization from a previous run if the CSV has not changed
+    X_normalized, scaler = load_or_fit_minmax(data_path, X, feature_columns)
+    
+    report_ranges(X, feature_columns, "   Original feature ranges:")
+    report_ranges(X_normalized, feature_columns, "\n   Normalized feature ranges (all should be 0-1):", check_unit_range=True)
+    
+    # Step 3: Split into training and test sets
+    print("\n3. Splitting data into training and test sets...")
+    # Stratified split as index arrays, the same indices can be reused for any view of the features
+    sss = StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+    (train_idx, test_idx), = sss.split(X_normalized, y)
+    # Train in float64 like the original MinMaxScaler pipeline did (same lbfgs solution). Converting
+    # once here gives fit(), predict() and every CV fold the same contiguous arrays to reuse
+    X_train = np.ascontiguousarray(X_normalized[train_idx], dtype=np.float64)
+    X_test = np.ascontiguousarray(X_normalized[test_idx], dtype=np.float64)
+    y_train, y_test = y[train_idx], y[test_idx]
+    print(f"   Training samples: {len(X_train)}")
+    print(f"   Test samples: {len(X_test)}")
+    
+    # Step 4: Train the model
+    print("\n4. Training Logistic Regression model...")
+    # Same solver as the healthcare trainer. lbfgs does not penalize the intercept (liblinear does),
+    # which matters here because the intercept is folded into the exported weights
+    model = LogisticRegression(
+        penalty='l2',
+        C=1.0,
+        solver='lbfgs',
+        max_iter=1000,
+        random_state=42
+    )
+    
+    model.fit(X_train, y_train)
+    print("   Training complete!")
+    
+    # Step 5: Evaluate the model
+    print("\n5. Evaluating model performance...")
+    
+    report_metrics(model, X_train, y_train, X_test, y_test, class_names)
+    
+    # Cross-validation
+    print("\n6. Performing 5-fold cross-validation...")
+    # One cross_validate call scores all four metrics on each fold's fit, the 5 independent
+    # folds run in parallel on all CPU cores (n_jobs=-1)
+    cv_results = cross_validate(model, X_train, y_train, cv=5,
+                                scoring=['accuracy', 'precision', 'recall', 'f1'], n_jobs=-1)
+    for name, label in (('accuracy', 'Accuracy'), ('precision', 'Precision'), ('recall', 'Recall'), ('f1', 'F1 Score')):
+        cv_scores = cv_results[f'test_{name}']
+        print(f"   CV {label}: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
+    
+    # Step 6: Save model coefficients
+    print("\n7. Saving model coefficients...")
+    
+    # Get coefficients (weights) for each class
+    coefs = model.coef_  # Shape: (n_classes, n_features)
+    
+    if intercept_scale:
+        intercept = model.intercept_  # Shape: (n_classes,)
+        
+        # IMPORTANT: Incorporate intercept into coefficients for encrypted operations
+        # The encrypted operations service doesn't add the intercept separately,
+        # so we need to include it in the coefficients.
+        # 
+        # Since features are normalized to 0-1, we can approximate:
+        # intercept + sum(features*weights) ≈ sum(features*(weights + intercept/n))
+        # where n = number of features
+        # 
+        # This works because on average, normalized features are around 0.5,
+        # so sum(features) ≈ n*0.5, and sum(features*intercept/n) ≈ intercept*0.5
+        # To get the full intercept, we use a scaling factor (empirically determined to be ~1.8)
+        # Broadcast add: each class row gets its own intercept share
+        intercept_per_feature = (intercept * intercept_scale) / len(feature_columns)  # Shape: (n_classes,)
+        coefs_with_intercept = coefs + intercept_per_feature[:, None]
+        
+        print(f"   Original intercept: {intercept[0]:.4f}")
+        print(f"   Intercept per feature: {intercept_per_feature[0]:.4f}")
+        print(f"   Adjusted first coefficient: {coefs[0][0]:.4f} -> {coefs_with_intercept[0][0]:.4f}")
+        coefs = coefs_with_intercept
+    
+    # Save to CSV (same format as other models)
+    # %.17g keeps every float64 digit, so the file reads back to exactly these weights and the
+    # abs_max in the JSON summary below is the largest value actually stored in the CSV
+    np.savetxt(output_coef_path, coefs, delimiter=",", fmt="%.17g")
+    print(f"   Saved coefficients to {output_coef_path}" + (" (with intercept incorporated)" if intercept_scale else ""))
+    print(f"   Coefficient shape: {coefs.shape} (classes x features)")
+    
+    if meta_output is not None:
+        with open(meta_output, "w") as f:
+            json.dump({"abs_max": float(np.abs(coefs).max()), "shape": list(coefs.shape)}, f)
+        print(f"   Saved coefficient summary to {meta_output}")
+    
+    # Step 7: Save normalized features for GUI use (without labels, no header)
+    if normalized_output is not None:
+        print("\n8. Saving normalized features for GUI use...")
+        # Save without header - EncryptedMLHelper expects no header row
+        np.savetxt(normalized_output, X_normalized, delimiter=",", fmt="%.6f")
+        print(f"   Saved normalized features to {normalized_output}")
+        print(f"   (Use this file in the GUI - already normalized to 0-1 range, no header)")
+        print(f"   Shape: {X_normalized.shape} (samples x features)")
+    
+    if export_original is not None:
+        # Also save original data without header for reference
+        # X already holds the original float32 features
+        # (%.7g is the precision float32 actually carries, so values come out as in the source CSV)
+        np.savetxt(export_original, X, delimiter=",", fmt="%.7g")
+        print(f"   Also saved original features (no header) to {export_original}")
+    
+    print("\n" + "=" * 60)
+    print("Training complete! Model ready for use.")
+    print("=" * 60)
+    
+    return model, X_test, y_test, scaler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the logistic regression models for the encrypted ML system.")
+    parser.add_argument("--all", action="store_true", help="train the academic and financial models in one process")
+    parser.add_argument("--normalize", nargs=2, metavar=("CSV", "OUTPUT"),
+                        help="only write the 0-1 normalized features of CSV to OUTPUT, reading it in chunks "
+                             "(for datasets too large to load at once)")
+    parser.add_argument("--label-col", default=None, help="label column to drop for --normalize (default: last column)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk for --normalize")
+    args = parser.parse_args()
+
+    if args.normalize:
+        data_path, output_path = args.normalize
+        write_normalized_streaming(data_path, output_path, label_col=args.label_col, chunksize=args.chunksize)
+        print(f"Saved normalized features to {output_path}")
+    elif args.all:
+        # Each model writes its own coefficient file so they don't overwrite each other
+        from train_academic_model_new import train_academic_model_from_csv
+        from train_financial_model_new import train_financial_model_from_csv
+        train_academic_model_from_csv(output_coef_path="academic_coefs.csv")
+        train_financial_model_from_csv(output_coef_path="financial_coefs.csv")
+    else:
+        parser.print_help()
@@ -19,21 +19,21 @@ HOW IT WORKS:
 """
 
 import numpy as np
-import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import LinearSVC, SVC
 from sklearn.model_selection import GridSearchCV, cross_val_score, cross_validate, StratifiedKFold
 from sklearn.feature_selection import RFE
 from sklearn.metrics import cohen_kappa_score, make_scorer, accuracy_score
-from joblib import dump, load
+from joblib import dump, load, parallel_backend
 from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from warnings import simplefilter
 from sklearn.exceptions import ConvergenceWarning
 from sklearn.feature_selection import chi2, mutual_info_classif
-from copy import deepcopy
 import matplotlib.pyplot as plt
 
+from _cache import cached_array, cached_arrays
+
 """
 This script uses the average accuracy across 5-fold cross validation to compare the preformance of different models, with different parameter settings, feature subsets, and feature selction techniques.
 """
@@ -46,6 +46,23 @@ def notrans(X):
     """
     return X
 
+def _apply_trans(X_all, t):
+    """
+    Return a copy of X_all with transformation t applied to the 2 continuous features.
+
+    Only columns 1-2 are touched, so a plain ndarray copy is enough (no deepcopy needed).
+    For np.log/np.log1p, np.finfo(float).eps is added first to avoid log(0) errors; both steps
+    run in place on the copy. The other transformations get the columns unshifted.
+    """
+    X = X_all.copy()
+    cols = X[:,1:3]
+    if t in (np.log, np.log1p):
+        np.add(cols, np.finfo(float).eps, out=cols)
+        t(cols, out=cols)
+    else:
+        X[:,1:3] = t(cols)
+    return X
+
 # Ignore warnings to keep output clean
 # ConvergenceWarning: Some models might not fully converge, but that's okay for comparison
 # FutureWarning: Warnings about future API changes
@@ -55,30 +72,39 @@ simplefilter(action='ignore', category=FutureWarning)
 # Load training data
 # X_all: Feature matrix (each row is a sample, each column is a feature)
 # Y: Labels (what we're trying to predict - e.g., cancer type)
-X_all =  pd.read_csv("feature_table.csv", header=None).to_numpy() #load unencrypted feature table
-Y = pd.read_csv("Y.csv", header=None).to_numpy().reshape((-1,)) # Reshape to 1D array
+# The CSVs are parsed once and cached as .npy files in .cache/ (see _cache.py), keyed on each CSV's
+# mtime and size, so an edited or regenerated CSV is parsed again. Later runs memory-map the binary
+# copies (read-only, X_all is never modified - transformations work on copies)
+# np.loadtxt parses straight into an array (no DataFrame copy) and rounds every value exactly
+X_all = cached_array("feature_table.csv", "parsed",
+                     lambda: np.loadtxt("feature_table.csv", delimiter=",", ndmin=2),
+                     mmap_mode='r') #load unencrypted feature table
+Y = cached_array("Y.csv", "parsed",
+                 lambda: np.loadtxt("Y.csv", delimiter=",", dtype=int, ndmin=1)) # 1D array of labels
 
 # Feature Selection: Rank features by how useful they are for prediction
 # We'll use this to remove less important features later
-
-# Method 1: Mutual Information - measures how much information a feature provides about the label
-# disMask tells the function which features are discrete (categorical) vs continuous
-# First 2 features are continuous, rest are discrete
-disMask = [False, False] + ([True] * (X_all.shape[1] - 2 ) )  #tells mi_score which features are discrete
-mi_scores = mutual_info_classif(X_all, Y, discrete_features=disMask )
-# Sort features by importance (most important first)
-mi_inds = np.argsort(mi_scores)
-
-# Method 2: Chi-squared test - measures independence between feature and label
-# Higher score = feature is more related to the label
-chi_scores = chi2(X_all,Y)[0]
-# Sort features by chi-squared score (highest score first)
-chi_inds = np.argsort(chi_scores)
-
-#np.save("chi_inds.npy",chi_inds)
-#np.save("mi_inds.npy",mi_inds)
-#chi_inds = np.load("Data/chi_inds.npy")
-#mi_inds = np.load("Data/mi_inds.npy")
+# The rankings only depend on the data, so they are cached next to the parsed CSVs (see _cache.py),
+# keyed on the mtime and size of both feature_table.csv and Y.csv
+def _rank_features():
+    # Method 1: Mutual Information - measures how much information a feature provides about the label
+    # disMask tells the function which features are discrete (categorical) vs continuous
+    # First 2 features are continuous, rest are discrete
+    disMask = [False, False] + ([True] * (X_all.shape[1] - 2 ) )  #tells mi_score which features are discrete
+    mi_scores = mutual_info_classif(X_all, Y, discrete_features=disMask )
+    # Sort features by importance (most important last)
+    mi_inds = np.argsort(mi_scores, kind='stable')
+
+    # Method 2: Chi-squared test - measures independence between feature and label
+    # Higher score = feature is more related to the label
+    chi_scores = chi2(X_all,Y)[0]
+    # Sort features by chi-squared score (highest score last)
+    chi_inds = np.argsort(chi_scores, kind='stable')
+    return {"mi_inds": mi_inds, "chi_inds": chi_inds}
+
+rankings = cached_arrays("feature_table.csv", "fs_rank", _rank_features, depends_on=("Y.csv",))
+mi_inds = rankings["mi_inds"]
+chi_inds = rankings["chi_inds"]
 
 # Define the machine learning models to test
 # We'll try different types to see which works best for this data
@@ -98,141 +124,132 @@ strTrans = ["None","MinMax","Standardize","log()","log(x+1)"]
 # - log(): Natural logarithm (helps with skewed data)
 # - log(x+1): Log with offset (handles zeros better than log)
 
+# Precompute the transformed feature matrix for every transformation once, up front
+# Each entry is an independent contiguous copy of X_all, so no scaler state is shared between them
+X_variants = [np.ascontiguousarray(_apply_trans(X_all, t)) for t in trans]
+
 # Define hyperparameter search spaces for each model
 # GridSearchCV will try all combinations to find the best settings
 parameterSets = [
     # Logistic Regression: Try different penalties (L1/L2) and regularization strengths (C)
-    {"penalty":['l1','l2'], 'C':[0.1,1, 10], 'solver':["liblinear","lbfgs"]},
+    # lbfgs only supports L2, so the grid is split into valid penalty/solver combinations
+    [{"penalty":['l1'], 'C':[0.1,1, 10], 'solver':["liblinear"]},
+     {"penalty":['l2'], 'C':[0.1,1, 10], 'solver':["liblinear","lbfgs"]}],
     # Random Forest: Try different split criteria and tree counts
     {'criterion':['gini', 'entropy'], 'n_estimators':[100,200,300], 'bootstrap':[False, True]},
     # Linear SVM: Try different penalties and loss functions
-    {'penalty':['l1', 'l2'], 'C':[0.1, 1, 10], 'max_iter':[10000], 'loss':['hinge', 'squared_hinge']},
+    # L1 is only supported with the squared hinge loss (solved in the primal, dual=False)
+    [{'penalty':['l1'], 'C':[0.1, 1, 10], 'max_iter':[10000], 'loss':['squared_hinge'], 'dual':[False]},
+     {'penalty':['l2'], 'C':[0.1, 1, 10], 'max_iter':[10000], 'loss':['hinge', 'squared_hinge']}],
     # Non-linear SVM: Try different kernels and regularization
     {'kernel':['poly', 'rbf'], 'C':[0.1, 1, 10]}
 ]
 
-# Open output file to save comparison results
-fp = open("ModelComparison.txt","w")
-
-# Track the best model found so far
-max_score = 0.0 #keep track of best score
-winnerString = "" #record best params and feature transformation/selection
+# The non-linear SVM is by far the slowest model to fit (libsvm scales O(n^2)-O(n^3) with the
+# number of samples), so it is left out of the main loop and only grid searched on the best
+# transformation/feature selection found by the other models
+n_svc = strClf.index("Non-Linear SVM")
 
-# Main comparison loop: Test every combination of model, transformation, and feature selection
-for n_clf, clf in enumerate(classifiers): #for each classifier
-
-    fp.write(""+str(strClf[n_clf])+":\n")
+# Use the same shuffled 5-fold split for every grid search so all configurations are
+# scored on identical folds
+cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
 
+# Open output file to save comparison results
+# The with-block closes the file even if a grid search raises, and the 64KB buffer batches the writes
+# parallel_backend keeps one loky worker pool alive for all of the grid searches instead of
+# starting a new pool for every GridSearchCV call
+with open("ModelComparison.txt","w",buffering=1<<16) as fp, parallel_backend('loky', n_jobs=-1):
+
+    # Track the best model found so far
+    max_score = 0.0 #keep track of best score
+    winnerString = "" #record best params and feature transformation/selection
+    best_config = None #feature transformation/selection of the best model, reused for the non-linear SVM
+
+    # Main comparison loop: Test every combination of transformation, feature selection, and model
+    # The classifiers are the innermost loop so each transformed and feature-selected matrix is
+    # built only once and then shared by all of the grid searches
     for n_trans in range(0,5): #for each transformation
 
-        fp.write("\t"+str(strTrans[n_trans])+":\n")
+        fp.write(""+str(strTrans[n_trans])+":\n")
 
-        # Copy features before applying transformation
-        # We need a copy because transformations modify the data
-        X = deepcopy(X_all)
-
-        # Apply the transformation to the first 2 features (which are continuous)
-        # np.finfo(float).eps adds a tiny value to avoid log(0) errors
-        X[1:3] = trans[n_trans](X[1:3] + np.finfo(float).eps)
+        # Feature matrix with this transformation already applied to the continuous features
+        X = X_variants[n_trans]
 
         # Test different numbers of features to remove
         # Removing less important features can improve performance and reduce overfitting
-        for n_feat in [2500,3500,4500]: #for each number of least informative features to remove
-
-            # Test with Chi-squared feature selection
-            fp.write("\t\tChi_feat: "+str(n_feat)+"\n")
-
-            # Remove the n_feat least important features (keep the rest)
-            # chi_inds is sorted, so [n_feat:] gets the most important features
-            X_selected = X[:,chi_inds[n_feat:]]
-
-            # Get the parameter search space for this model type
-            parameters = parameterSets[n_clf]
-
-            # Perform grid search: Try all parameter combinations and find the best
-            # n_jobs=-1 means use all CPU cores for faster processing
-            GS = GridSearchCV(clf, parameters, n_jobs=-1)
-            GS.fit(X_selected, Y)  # Train on the selected features
-
-            # Write results: accuracy and best parameters found
-            fp.write("\t\t\tAcc:"+"{:0.16f}".format(GS.best_score_)+"\t")
-            for (x, y) in GS.best_params_.items():
-                fp.write(str(x)+":"+str(y)+" ")
-            fp.write("\n")
-
-            # Update best model if this one is better
-            if GS.best_score_ > max_score:
-                winnerString = strClf[n_clf]+" is the winner with "+str(n_feat)+" features removed using Chi_squared, "+strTrans[n_trans]+" feature transformation, and the following params:"
-                winnerString += str(GS.best_params_)
-                max_score = GS.best_score_
-
-            #-------------repeat above for Mutual Information feature selection
-            fp.write("\t\tMI_feat: "+str(n_feat)+"\n")
-
-            # Remove the n_feat least important features using Mutual Information ranking
-            X_selected = X[:,mi_inds[n_feat:]]
-
-            # Get the parameter search space for this model type
-            parameters = parameterSets[n_clf]
-
-            # Perform grid search with MI-selected features
-            GS = GridSearchCV(clf, parameters, n_jobs=-1)
-            GS.fit(X_selected, Y)
-
-            # Write results
-            fp.write("\t\t\tAcc:"+"{:0.16f}".format(GS.best_score_)+"\t")
-            for (x, y) in GS.best_params_.items():
-                fp.write(str(x)+":"+str(y)+" ")
-            fp.write("\n")
-
-            # Update best model if this one is better
-            if GS.best_score_ > max_score:
-                winnerString = strClf[n_clf]+" is the winner with "+str(n_feat)+" features removed using Mutual Importance, "+strTrans[n_trans]+" feature transformation, and the following params:"
-                winnerString += str(GS.best_params_)
-                max_score = GS.best_score_
-
-    fp.write("\n\n")
-
-
-# Also test using ALL features (no feature selection)
-# Sometimes using all features works better than removing any
-fp.write("All features\n")
-for n_clf, clf in enumerate(classifiers):
-    
-    fp.write("\t"+str(strClf[n_clf])+":\n")
-
-    for n_trans in range(0,5):
-
-        fp.write("\t\t"+str(strTrans[n_trans])+":\n")
-        
-        # Copy features before applying transformation
-        X = deepcopy(X_all)
-
-        # Apply transformation
-        X[1:3] = trans[n_trans](X[1:3] + np.finfo(float).eps)
-        
-        # Get parameter search space for this model
-        parameters = parameterSets[n_clf]
-
-        # Perform grid search using ALL features (no feature selection)
-        GS = GridSearchCV(clf, parameters, n_jobs=-1)
-        GS.fit(X, Y)
-
-        # Write results
-        fp.write("\t\t\tAcc:"+"{:0.16f}".format(GS.best_score_)+"\t")
-        for (x, y) in GS.best_params_.items():
-            fp.write(str(x)+":"+str(y)+" ")
-        fp.write("\n")
-
-        # Update best model if this one is better
-        if GS.best_score_ > max_score:
-            winnerString = strClf[n_clf]+" is the winner using all features, "+strTrans[n_trans]+" feature transformation, and the following params:"
-            winnerString += str(GS.best_params_)
-            max_score = GS.best_score_
-
-# Write summary: The best model found across all combinations
-fp.write("\n\nBest Preforming Model:\n")
-fp.write("Accuracy: "+str(max_score)+"\n")
-fp.write(str(winnerString)+"\n")
-
-fp.close()
\ No newline at end of file
+        # n_feat=0 means no feature selection (sometimes using all features works better than removing any)
+        for n_feat in [0,2500,3500,4500]: #for each number of least informative features to remove
+
+            if n_feat == 0:
+                # All features: a single pass, no selector needed
+                selectors = [("All features", None, None)]
+            else:
+                # Test with Chi-squared and Mutual Information feature selection
+                selectors = [("Chi_feat", "Chi_squared", chi_inds), ("MI_feat", "Mutual Importance", mi_inds)]
+
+            for sel_name, sel_label, sel_inds in selectors:
+
+                if n_feat == 0:
+                    fp.write("\t"+sel_name+"\n")
+                    X_selected = X
+                    method = "using all features"
+                else:
+                    fp.write("\t"+sel_name+": "+str(n_feat)+"\n")
+
+                    # Remove the n_feat least important features (keep the rest)
+                    # sel_inds is sorted, so [n_feat:] gets the most important features
+                    # The selected columns are materialized once as a contiguous (row-major) array for all classifiers
+                    X_selected = np.ascontiguousarray(X[:,sel_inds[n_feat:]])
+                    method = "with "+str(n_feat)+" features removed using "+sel_label
+
+                for n_clf, clf in enumerate(classifiers): #for each classifier
+
+                    if n_clf == n_svc:
+                        continue
+
+                    fp.write("\t\t"+str(strClf[n_clf])+":\n")
+
+                    # Get the parameter search space for this model type
+                    parameters = parameterSets[n_clf]
+
+                    # Perform grid search: Try all parameter combinations and find the best
+                    # n_jobs=-1 means use all CPU cores for faster processing
+                    # refit=False skips the final refit on all data, only best_score_/best_params_ are used
+                    GS = GridSearchCV(clf, parameters, n_jobs=-1, cv=cv, refit=False)
+                    GS.fit(X_selected, Y)  # Train on the selected features
+
+                    # Write results: accuracy and best parameters found
+                    # The whole record is built first and written with a single call
+                    line = "\t\t\tAcc:"+"{:0.16f}".format(GS.best_score_)+"\t"
+                    line += "".join(str(x)+":"+str(y)+" " for (x, y) in GS.best_params_.items())
+                    fp.write(line+"\n")
+
+                    # Update best model if this one is better
+                    if GS.best_score_ > max_score:
+                        winnerString = strClf[n_clf]+" is the winner "+method+", "+strTrans[n_trans]+" feature transformation, and the following params:"
+                        winnerString += str(GS.best_params_)
+                        max_score = GS.best_score_
+                        best_config = (n_trans, sel_name, n_feat, method, X_selected)
+
+        fp.write("\n\n")
+
+    # Non-linear SVM: a single grid search on the best configuration found above
+    n_trans, sel_name, n_feat, method, X_selected = best_config
+    fp.write(strClf[n_svc]+" ("+strTrans[n_trans]+", "+sel_name+("" if n_feat == 0 else ": "+str(n_feat))+"):\n")
+
+    GS = GridSearchCV(classifiers[n_svc], parameterSets[n_svc], n_jobs=-1, cv=cv, refit=False)
+    GS.fit(X_selected, Y)
+
+    line = "\tAcc:"+"{:0.16f}".format(GS.best_score_)+"\t"
+    line += "".join(str(x)+":"+str(y)+" " for (x, y) in GS.best_params_.items())
+    fp.write(line+"\n")
+
+    if GS.best_score_ > max_score:
+        winnerString = strClf[n_svc]+" is the winner "+method+", "+strTrans[n_trans]+" feature transformation, and the following params:"
+        winnerString += str(GS.best_params_)
+        max_score = GS.best_score_
+
+    # Write summary: The best model found across all combinations
+    fp.write("\n\nBest Preforming Model:\n")
+    fp.write("Accuracy: "+str(max_score)+"\n")
+    fp.write(str(winnerString)+"\n")
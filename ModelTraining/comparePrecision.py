@@ -1,6 +1,6 @@
 import numpy as np
-import pandas as pd
-import os
+
+from _cache import cached_array
 
 
 """
@@ -11,10 +11,15 @@ accuracy each percision achieves, and the weighted sums are ranked to see how mu
 weighted sums found with the true/full-percision weights/coefficients and features
 """
 
-coefs = pd.read_csv("ceofs_true.csv",header=None).to_numpy() #load coefficients from clf (includes bias)
-X_raw =  pd.read_csv("feature_table.csv",header=None).to_numpy() #load unencrypted feature table
-Y_true = pd.read_csv("Y.csv", header=None).to_numpy() #load labels
-
+#np.loadtxt parses the numeric CSVs straight into arrays, no DataFrame in between
+coefs = np.loadtxt("ceofs_true.csv", delimiter=",", ndmin=2) #load coefficients from clf (includes bias)
+#binary copies of the parsed CSVs are shared with compareModels.py through .cache/ (see _cache.py),
+#keyed on each CSV's mtime and size so an edited CSV is parsed again
+X_raw = cached_array("feature_table.csv", "parsed",
+                     lambda: np.loadtxt("feature_table.csv", delimiter=",", ndmin=2),
+                     mmap_mode='r') #load unencrypted feature table
+Y_true = cached_array("Y.csv", "parsed",
+                      lambda: np.loadtxt("Y.csv", delimiter=",", dtype=int, ndmin=1)) #load labels
 
 #use full precision features, weights, and bias
 X_plain = np.append(np.ones((X_raw.shape[0],1)), X_raw, axis=1)
@@ -27,17 +27,26 @@ Cancer Classification Logic (from report):
 """
 
 import numpy as np
-import pandas as pd
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
-from sklearn.preprocessing import MinMaxScaler
+from sklearn.model_selection import StratifiedShuffleSplit, cross_val_score
+import json
 import os
 
-def train_healthcare_model_from_csv():
+from _train_common import find_data_file, fit_minmax, read_table, report_metrics, report_ranges
+
+def train_healthcare_model_from_csv(verbose=False, use_sklearnex=False):
     """
     Train a logistic regression model using Healthcare_Data.csv.
     
+    PARAMETERS:
+    - verbose: Also print the dataset diagnostics (columns, label distribution and
+      per-feature ranges). Off by default so programmatic calls skip those extra
+      passes over the data; running the script directly turns it on.
+    - use_sklearnex: Use the LogisticRegression from Intel Extension for Scikit-learn
+      (pip install scikit-learn-intelex, oneDAL's faster lbfgs) if it is installed.
+      Nothing is patched globally, so importing this module never changes sklearn for
+      the caller; running the script directly turns it on.
+    
     RETURNS:
     - model: Trained logistic regression model
     - X_test: Test features (normalized)
@@ -51,70 +60,77 @@ def train_healthcare_model_from_csv():
     # Step 1: Load the data
     print("\n1. Loading training data...")
     
-    data_path = "../Data/Healthcare_Data.csv"
-    if not os.path.exists(data_path):
-        data_path = "Healthcare_Data.csv"
-        if not os.path.exists(data_path):
-            raise FileNotFoundError(f"Could not find Healthcare_Data.csv. Please ensure it's in Data/ or ModelTraining/ directory.")
+    # Data/ when run from ModelTraining/, else the current directory (same lookup as the other trainers)
+    data_path = find_data_file("Healthcare_Data.csv")
     
     # Read CSV - explicitly use first row as header
-    df = pd.read_csv(data_path, header=0)
-    print(f"   Loaded {len(df)} patients")
-    print(f"   Columns: {list(df.columns)}")
+    # Every column is numeric, so the whole table comes back as one float32 array. read_table keeps
+    # the parsed table in ModelTraining/.cache/ keyed on the CSV's mtime and size, so later runs
+    # skip the text parse until the CSV changes
+    header, arr = read_table(data_path)
+    print(f"   Loaded {len(arr)} patients")
+    if verbose:
+        print(f"   Columns: {header}")
     
     # Separate features and labels
     # Exclude has_cancer from features
-    if 'has_cancer' in df.columns:
-        feature_columns = [col for col in df.columns if col != 'has_cancer']
-        X = df[feature_columns].values
-        y = df['has_cancer'].values.astype(int)
+    if 'has_cancer' in header:
+        li = header.index('has_cancer')
         print(f"   Found 'has_cancer' column - using as label")
     else:
         # Assume last column is the label
-        feature_columns = df.columns[:-1].tolist()
-        X = df.iloc[:, :-1].values
-        y = df.iloc[:, -1].values.astype(int)
+        li = len(header) - 1
         print(f"   'has_cancer' not found - using last column as label")
-        print(f"   Label column: {df.columns[-1]}")
-    
-    print(f"   Features ({len(feature_columns)}): {feature_columns}")
-    print(f"   Feature matrix shape: {X.shape}")
-    print(f"   Label distribution: {np.bincount(y)}")
-    print(f"   Cancer patients: {np.sum(y)} ({100*np.sum(y)/len(y):.1f}%)")
-    print(f"   Non-cancer patients: {len(y)-np.sum(y)} ({100*(len(y)-np.sum(y))/len(y):.1f}%)")
+        print(f"   Label column: {header[-1]}")
+    feature_columns = [col for i, col in enumerate(header) if i != li]
+    X = np.delete(arr, li, axis=1)
+    # 0/1 indicator: int8 is all it needs (8x smaller than the default int64 for the metric passes)
+    y = arr[:, li].astype(np.int8, copy=False)
+    del arr
+    
+    if verbose:
+        print(f"   Features ({len(feature_columns)}): {feature_columns}")
+        print(f"   Feature matrix shape: {X.shape}")
+        counts = np.bincount(y, minlength=2)
+        n = counts.sum()
+        print(f"   Label distribution: {counts}")
+        print(f"   Cancer patients: {counts[1]} ({100*counts[1]/n:.1f}%)")
+        print(f"   Non-cancer patients: {counts[0]} ({100*counts[0]/n:.1f}%)")
     
     # Step 2: Normalize features to 0-1 range
     # CRITICAL: Encrypted ML requires all features in 0-1 range
     print("\n2. Normalizing features to 0-1 range...")
     print("   (Required for encrypted ML compatibility)")
     
-    scaler = MinMaxScaler()
-    X_normalized = scaler.fit_transform(X)
+    # fit_minmax returns X scaled to 0-1 and a Scaler(min_, scale_) with the same meaning as
+    # MinMaxScaler's attributes. X_normalized stays float32, the 0-1 values don't need more precision
+    X_normalized, scaler = fit_minmax(X)
     
-    print(f"   Original feature ranges:")
-    for i, col in enumerate(feature_columns):
-        min_val = X[:, i].min()
-        max_val = X[:, i].max()
-        print(f"     {col:25s}: [{min_val:8.2f}, {max_val:8.2f}]")
-    
-    print(f"\n   Normalized feature ranges (all should be 0-1):")
-    for i, col in enumerate(feature_columns):
-        min_val = X_normalized[:, i].min()
-        max_val = X_normalized[:, i].max()
-        status = "OK" if 0 <= min_val and max_val <= 1 else "ERROR"
-        print(f"     {col:25s}: [{min_val:.3f}, {max_val:.3f}] {status}")
+    if verbose:
+        report_ranges(X, feature_columns, "   Original feature ranges:")
+        report_ranges(X_normalized, feature_columns, "\n   Normalized feature ranges (all should be 0-1):", check_unit_range=True)
     
     # Step 3: Split into training and test sets
     print("\n3. Splitting data into training and test sets...")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_normalized, y, test_size=0.2, random_state=42, stratify=y
-    )
+    # Stratified split as index arrays, same splitter and seed as the academic/financial trainers
+    sss = StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+    (train_idx, test_idx), = sss.split(X_normalized, y)
+    X_train, X_test = X_normalized[train_idx], X_normalized[test_idx]
+    y_train, y_test = y[train_idx], y[test_idx]
     print(f"   Training samples: {len(X_train)}")
     print(f"   Test samples: {len(X_test)}")
     
     # Step 4: Train the model
     print("\n4. Training Logistic Regression model...")
-    model = LogisticRegression(
+    estimator = LogisticRegression
+    if use_sklearnex:
+        try:
+            from sklearnex.linear_model import LogisticRegression as estimator
+            print("   Using scikit-learn-intelex LogisticRegression")
+        except ImportError:
+            # Not installed, the stock scikit-learn solver is used
+            pass
+    model = estimator(
         penalty='l2',
         C=1.0,
         solver='lbfgs',
@@ -128,43 +144,13 @@ def train_healthcare_model_from_csv():
     # Step 5: Evaluate the model
     print("\n5. Evaluating model performance...")
     
-    # Training set predictions
-    y_train_pred = model.predict(X_train)
-    train_accuracy = accuracy_score(y_train, y_train_pred)
-    train_precision = precision_score(y_train, y_train_pred, zero_division=0)
-    train_recall = recall_score(y_train, y_train_pred, zero_division=0)
-    train_f1 = f1_score(y_train, y_train_pred, zero_division=0)
-    
-    print(f"\n   Training Set Performance:")
-    print(f"   - Accuracy:  {train_accuracy:.4f}")
-    print(f"   - Precision: {train_precision:.4f}")
-    print(f"   - Recall:    {train_recall:.4f}")
-    print(f"   - F1 Score:  {train_f1:.4f}")
-    
-    # Test set predictions
-    y_test_pred = model.predict(X_test)
-    test_accuracy = accuracy_score(y_test, y_test_pred)
-    test_precision = precision_score(y_test, y_test_pred, zero_division=0)
-    test_recall = recall_score(y_test, y_test_pred, zero_division=0)
-    test_f1 = f1_score(y_test, y_test_pred, zero_division=0)
-    
-    print(f"\n   Test Set Performance:")
-    print(f"   - Accuracy:  {test_accuracy:.4f}")
-    print(f"   - Precision: {test_precision:.4f}")
-    print(f"   - Recall:    {test_recall:.4f}")
-    print(f"   - F1 Score:  {test_f1:.4f}")
-    
-    # Confusion matrix
-    cm = confusion_matrix(y_test, y_test_pred)
-    print(f"\n   Confusion Matrix (Test Set):")
-    print(f"   True Negatives (Non-Cancer):  {cm[0,0]}")
-    print(f"   False Positives:             {cm[0,1]}")
-    print(f"   False Negatives:             {cm[1,0]}")
-    print(f"   True Positives (Cancer):      {cm[1,1]}")
+    report_metrics(model, X_train, y_train, X_test, y_test, class_names=("Non-Cancer", "Cancer"))
     
     # Cross-validation
     print("\n6. Performing 5-fold cross-validation...")
-    cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy')
+    # The 5 folds are independent, run them in parallel on all CPU cores (n_jobs=-1),
+    # same as the academic/financial trainers
+    cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy', n_jobs=-1)
     print(f"   CV Accuracy: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
     
     # Step 6: Save model coefficients
@@ -185,20 +171,32 @@ def train_healthcare_model_from_csv():
     # This works because on average, normalized features are around 0.5,
     # so sum(features) ≈ n*0.5, and sum(features*intercept/n) ≈ intercept*0.5
     # To get the full intercept, we use a scaling factor (empirically determined to be ~1.8)
-    intercept_per_feature = (intercept[0] * 1.8) / len(feature_columns)
-    coefs_with_intercept = coefs.copy()
-    coefs_with_intercept[0] = coefs[0] + intercept_per_feature
+    # (A separate constant-1 bias feature would be exact, but the GUI pairs every weight with one
+    # column of the user's 10-feature data file, so the intercept has to live in the 10 weights.)
+    intercept_per_feature = (intercept * 1.8) / len(feature_columns)  # Shape: (n_classes,)
+    coefs_with_intercept = coefs + intercept_per_feature[:, None]
     
     print(f"   Original intercept: {intercept[0]:.4f}")
-    print(f"   Intercept per feature: {intercept_per_feature:.4f}")
+    print(f"   Intercept per feature: {intercept_per_feature[0]:.4f}")
     print(f"   Adjusted first coefficient: {coefs[0][0]:.4f} -> {coefs_with_intercept[0][0]:.4f}")
     
     # Also scale coefficients to match financial model magnitude (prevents precision loss)
     # Load financial model to get scaling factor
-    financial_coefs_path = "../SystemArchitecture/configDB/FinancialFraud/coefs.csv"
-    if os.path.exists(financial_coefs_path):
-        financial_coefs = pd.read_csv(financial_coefs_path, header=None).values[0]
-        scale_factor = np.abs(financial_coefs).max() / np.abs(coefs_with_intercept[0]).max()
+    # Only its largest absolute weight is needed: read it from the JSON summary the financial
+    # trainer writes (unless coefs.csv was replaced after it), otherwise from coefs.csv itself
+    financial_dir = "../SystemArchitecture/configDB/FinancialFraud"
+    financial_coefs_path = os.path.join(financial_dir, "coefs.csv")
+    financial_meta_path = os.path.join(financial_dir, "financial_coefs_meta.json")
+    financial_abs_max = None
+    if (os.path.exists(financial_meta_path) and os.path.exists(financial_coefs_path)
+            and os.path.getmtime(financial_meta_path) >= os.path.getmtime(financial_coefs_path)):
+        with open(financial_meta_path) as f:
+            # np.float64 like the CSV path (a plain Python float would leave the result float32)
+            financial_abs_max = np.float64(json.load(f)["abs_max"])
+    elif os.path.exists(financial_coefs_path):
+        financial_abs_max = np.abs(np.loadtxt(financial_coefs_path, delimiter=",", ndmin=2)[0]).max()
+    if financial_abs_max is not None:
+        scale_factor = financial_abs_max / np.abs(coefs_with_intercept[0]).max()
         coefs_final = coefs_with_intercept * scale_factor
         print(f"   Scale factor (to match financial magnitude): {scale_factor:.2f}x")
         print(f"   Final coefficient range: [{coefs_final[0].min():.2f}, {coefs_final[0].max():.2f}]")
@@ -206,20 +204,25 @@ def train_healthcare_model_from_csv():
         coefs_final = coefs_with_intercept
         print(f"   Financial model not found, skipping magnitude scaling")
     
-    # Save to CSV (same format as other models)
-    pd.DataFrame(coefs_final).to_csv("coefs.csv", header=False, index=False)
+    # Save to CSV (same format as other models, one row per class, no header)
+    # %.17g keeps every float64 digit, so the CSV reads back to exactly the same weights
+    np.savetxt("coefs.csv", coefs_final, delimiter=",", fmt="%.17g")
     print(f"   Saved coefficients to coefs.csv (with intercept incorporated)")
+    # Binary copy as well: the exact float64 values and a single read with np.load("coefs.npy"),
+    # no text parsing (the GUI still reads coefs.csv). The model is trained on float32, so without
+    # the financial scaling coefs_final is still float32 and is widened (exactly) here
+    np.save("coefs.npy", np.asarray(coefs_final, dtype=np.float64))
+    print(f"   Saved binary copy to coefs.npy")
     print(f"   Coefficient shape: {coefs_final.shape} (classes x features)")
     
     # Step 7: Save normalized features for GUI use (without labels, no header)
     print("\n8. Saving normalized features for GUI use...")
-    normalized_features_df = pd.DataFrame(X_normalized)
     output_path = "../Data/Healthcare_Data_Normalized.csv"
     # Save without header - EncryptedMLHelper expects no header row
-    normalized_features_df.to_csv(output_path, index=False, header=False)
+    np.savetxt(output_path, X_normalized, delimiter=",", fmt="%.6f")
     print(f"   Saved normalized features to {output_path}")
     print(f"   (Use this file in the GUI - already normalized to 0-1 range, no header)")
-    print(f"   Shape: {normalized_features_df.shape} (samples x features)")
+    print(f"   Shape: {X_normalized.shape} (samples x features)")
     
     print("\n" + "=" * 60)
     print("Training complete! Model ready for use.")
@@ -232,5 +235,5 @@ def train_healthcare_model_from_csv():
     return model, X_test, y_test, scaler
 
 if __name__ == "__main__":
-    model, X_test, y_test, scaler = train_healthcare_model_from_csv()
+    model, X_test, y_test, scaler = train_healthcare_model_from_csv(verbose=True, use_sklearnex=True)
 